@@ -4,152 +4,317 @@ Pride Dealer Services - HTML to PowerPoint Converter
 Converts the HTML presentation to a professional PowerPoint deck
 """
 
+import itertools
 import os
+import re
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.enum.shapes import MSO_SHAPE
-from bs4 import BeautifulSoup
+from pptx.oxml.ns import qn
+from lxml.etree import SubElement
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 
-def parse_html_file(html_path='index.html'):
-    """Parse the HTML file and extract slide content"""
+READ_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+# Define brand colors from your CSS
+BRAND_GOLD = RGBColor(212, 175, 55)    # #d4af37
+BRAND_DARK = RGBColor(184, 148, 31)    # #b8941f
+DARK_BLUE = RGBColor(26, 26, 46)       # #1a1a2e
+SURFACE_BLUE = RGBColor(22, 33, 62)    # #16213e
+ACCENT_BLUE = RGBColor(15, 52, 96)     # #0f3460
+WHITE = RGBColor(255, 255, 255)
+LIGHT_GRAY = RGBColor(204, 204, 204)
+
+# Font sizes and paragraph spacing
+TITLE_SLIDE_TITLE_SIZE = Pt(44)
+TITLE_SLIDE_SUBTITLE_SIZE = Pt(18)
+TITLE_SIZE = Pt(32)
+BODY_SIZE = Pt(14)
+BULLET_SIZE = Pt(12)
+BULLET_SPACE_BEFORE = Pt(4)
+PARAGRAPH_SPACE_AFTER = Pt(8)
+
+# Slide content is truncated to this many characters
+CONTENT_CHAR_LIMIT = 1500
+
+# Matches "slide" as a whole class token, so "slide hidden" matches but
+# "slide-navigation" does not. SoupStrainer sees the raw attribute string.
+SLIDE_CLASS_RE = re.compile(r'(?:^|\s)slide(?:\s|$)')
+
+# Runs of three or more line breaks, collapsed to a single blank line
+MULTI_NEWLINE_RE = re.compile(r'\n{3,}')
+
+# (tag name, class) -> bucket; a class of None matches any tag with that name
+SLIDE_ELEMENT_KINDS = {
+    ('p', None): 'paragraphs',
+    ('div', 'metric-box'): 'metric_boxes',
+    ('ul', 'key-facts'): 'key_facts',
+    ('ul', None): 'lists',
+    ('table', 'financial-table'): 'tables',
+    ('div', 'partnership-section'): 'partnerships',
+}
+
+# Unbound bs4 methods, called directly in the extractors to skip per-element attribute lookups
+tag_get = Tag.get
+tag_get_text = Tag.get_text
+tag_find = Tag.find
+tag_find_all = Tag.find_all
+
+def collect_slide_elements(slide):
+    """Walk a slide once and bucket the elements each extractor needs, in document order"""
     
-    if not os.path.exists(html_path):
-        print(f"Error: {html_path} not found in current directory")
-        return None
+    found = {kind: [] for kind in SLIDE_ELEMENT_KINDS.values()}
     
-    with open(html_path, 'r', encoding='utf-8') as file:
-        content = file.read()
+    get_kind = SLIDE_ELEMENT_KINDS.get
     
-    soup = BeautifulSoup(content, 'html.parser')
-    slides_data = []
+    for elem in slide.descendants:
+        if not isinstance(elem, Tag):
+            continue
+        
+        name = elem.name
+        kind = None
+        for cls in tag_get(elem, 'class') or ():
+            kind = get_kind((name, cls))
+            if kind:
+                break
+        if kind is None:
+            kind = get_kind((name, None))
+        if kind:
+            found[kind].append(elem)
     
-    # Find all slides
-    slides = soup.find_all('div', class_='slide')
+    return found
+
+def stripped_text(elem, cache):
+    """Return an element's stripped text, extracting it at most once per cache"""
     
-    for i, slide in enumerate(slides, 1):
-        slide_data = {'slide_number': i}
+    key = id(elem)
+    text = cache.get(key)
+    if text is None:
+        text = cache[key] = tag_get_text(elem).strip()
+    return text
+
+def find_fact_spans(item):
+    """Return the first fact-label and fact-value spans inside a key-facts item"""
+    
+    label_elem = value_elem = None
+    for span in tag_find_all(item, 'span'):
+        classes = tag_get(span, 'class') or ()
+        if label_elem is None and 'fact-label' in classes:
+            label_elem = span
+        elif value_elem is None and 'fact-value' in classes:
+            value_elem = span
+    return label_elem, value_elem
+
+def iter_content_parts(found, title, text_cache):
+    """Yield a slide's content lines extractor by extractor, in output order"""
+    
+    # Get main paragraphs (excluding titles)
+    for p in found['paragraphs']:
+        text = stripped_text(p, text_cache)
+        if text and text != title and len(text) > 10:
+            yield text
+    
+    # Get metric boxes
+    for box in found['metric_boxes']:
+        # Find the heading, metric spans and paragraphs in one pass over the box.
+        # Metric spans are grouped by their parent element and values are zipped
+        # with labels within each group, in either order, so a missing half
+        # cannot shift the metrics held in other containers.
+        h3 = None
+        metric_groups = {}
+        box_paras = []
+        for elem in box.descendants:
+            if not isinstance(elem, Tag):
+                continue
+            name = elem.name
+            if name == 'h3':
+                if h3 is None:
+                    h3 = elem
+            elif name == 'span':
+                classes = tag_get(elem, 'class') or ()
+                if 'metric-value' in classes:
+                    side = 0
+                elif 'metric-label' in classes:
+                    side = 1
+                else:
+                    continue
+                group = metric_groups.setdefault(id(elem.parent), ([], []))
+                group[side].append(elem)
+            elif name == 'p':
+                box_paras.append(elem)
         
-        # Extract title
-        title_elem = slide.find(['h1', 'h2'])
-        if title_elem:
-            slide_data['title'] = title_elem.get_text().strip()
-        else:
-            slide_data['title'] = f"Slide {i}"
+        if h3:
+            yield f"\n{tag_get_text(h3).strip()}:"
         
-        # Extract content parts
-        content_parts = []
+        yield from (
+            f"• {tag_get_text(value).strip()} - {tag_get_text(label).strip()}"
+            for values, labels in metric_groups.values()
+            for value, label in zip(values, labels)
+        )
         
-        # Get main paragraphs (excluding titles)
-        paragraphs = slide.find_all('p')
-        for p in paragraphs:
-            text = p.get_text().strip()
-            if text and text != slide_data.get('title', '') and len(text) > 10:
-                content_parts.append(text)
+        # Get paragraphs in metric box
+        for p in box_paras:
+            text = stripped_text(p, text_cache)
+            if text and len(text) > 10:
+                yield f"• {text}"
+    
+    # Get key facts lists
+    for facts in found['key_facts']:
+        items = tag_find_all(facts, 'li')
+        for item in items:
+            label_elem, value_elem = find_fact_spans(item)
+            if label_elem and value_elem:
+                label = stripped_text(label_elem, text_cache)
+                value = stripped_text(value_elem, text_cache)
+                yield f"• {label}: {value}"
+            else:
+                # Regular list item
+                text = tag_get_text(item).strip()
+                if text:
+                    yield f"• {text}"
+    
+    # Get regular lists
+    for ul in found['lists']:
+        items = tag_find_all(ul, 'li')
+        for li in items:
+            text = tag_get_text(li).strip()
+            if text and not text.startswith('•'):
+                yield f"• {text}"
+    
+    # Get tables
+    for table in found['tables']:
+        yield "\nFinancial Data:"
+        headers = tag_find_all(table, 'th')
+        if headers:
+            header_text = " | ".join([tag_get_text(th).strip() for th in headers])
+            yield header_text
+            yield "-" * len(header_text)
         
-        # Get metric boxes
-        metric_boxes = slide.find_all('div', class_='metric-box')
-        for box in metric_boxes:
-            h3 = box.find('h3')
-            if h3:
-                content_parts.append(f"\n{h3.get_text().strip()}:")
-            
-            # Get metrics
-            metric_values = box.find_all('span', class_='metric-value')
-            metric_labels = box.find_all('span', class_='metric-label')
-            
-            for value, label in zip(metric_values, metric_labels):
-                content_parts.append(f"• {value.get_text().strip()} - {label.get_text().strip()}")
-            
-            # Get paragraphs in metric box
-            box_paras = box.find_all('p')
-            for p in box_paras:
-                text = p.get_text().strip()
-                if text and len(text) > 10:
-                    content_parts.append(f"• {text}")
+        rows = tag_find_all(table, 'tr')[1:]  # Skip header row
+        row_cells = (tag_find_all(row, 'td') for row in rows)
+        yield from (
+            " | ".join([tag_get_text(cell).strip() for cell in cells])
+            for cells in row_cells if cells
+        )
+    
+    # Get partnership sections
+    for partnership in found['partnerships']:
+        h3 = tag_find(partnership, 'h3')
+        if h3:
+            yield f"\n{tag_get_text(h3).strip()}:"
         
-        # Get key facts lists
-        key_facts = slide.find_all('ul', class_='key-facts')
-        for facts in key_facts:
-            items = facts.find_all('li')
+        for fact_list in tag_find_all(partnership, 'ul'):
+            if 'key-facts' not in (tag_get(fact_list, 'class') or ()):
+                continue
+            items = tag_find_all(fact_list, 'li')
             for item in items:
-                label_elem = item.find('span', class_='fact-label')
-                value_elem = item.find('span', class_='fact-value')
-                if label_elem and value_elem:
-                    label = label_elem.get_text().strip()
-                    value = value_elem.get_text().strip()
-                    content_parts.append(f"• {label}: {value}")
-                else:
-                    # Regular list item
-                    text = item.get_text().strip()
-                    if text:
-                        content_parts.append(f"• {text}")
-        
-        # Get regular lists
-        regular_lists = slide.find_all('ul', class_=lambda x: x != 'key-facts' if x else True)
-        for ul in regular_lists:
-            if 'key-facts' not in (ul.get('class') or []):
-                items = ul.find_all('li')
-                for li in items:
-                    text = li.get_text().strip()
-                    if text and not text.startswith('•'):
-                        content_parts.append(f"• {text}")
-        
-        # Get tables
-        tables = slide.find_all('table', class_='financial-table')
-        for table in tables:
-            content_parts.append("\nFinancial Data:")
-            headers = table.find_all('th')
-            if headers:
-                header_text = " | ".join([th.get_text().strip() for th in headers])
-                content_parts.append(header_text)
-                content_parts.append("-" * len(header_text))
-            
-            rows = table.find_all('tr')[1:]  # Skip header row
-            for row in rows:
-                cells = row.find_all('td')
-                if cells:
-                    row_text = " | ".join([cell.get_text().strip() for cell in cells])
-                    content_parts.append(row_text)
-        
-        # Get partnership sections
-        partnerships = slide.find_all('div', class_='partnership-section')
-        for partnership in partnerships:
-            h3 = partnership.find('h3')
-            if h3:
-                content_parts.append(f"\n{h3.get_text().strip()}:")
-            
-            facts = partnership.find_all('ul', class_='key-facts')
-            for fact_list in facts:
-                items = fact_list.find_all('li')
-                for item in items:
-                    label = item.find('span', class_='fact-label')
-                    value = item.find('span', class_='fact-value')
-                    if label and value:
-                        content_parts.append(f"• {label.get_text().strip()}: {value.get_text().strip()}")
+                label, value = find_fact_spans(item)
+                if label and value:
+                    yield f"• {stripped_text(label, text_cache)}: {stripped_text(value, text_cache)}"
+
+def clean_content(content_parts):
+    """Join content parts, collapsing excessive line breaks and surrounding whitespace"""
+    
+    content = '\n'.join(content_parts)
+    content = MULTI_NEWLINE_RE.sub('\n\n', content)  # Remove excessive line breaks
+    return content.strip()
+
+def extract_slide(slide_number, slide, max_chars=CONTENT_CHAR_LIMIT):
+    """Extract the title and cleaned content of a single slide"""
+    
+    slide_data = {'slide_number': slide_number}
+    
+    # Extract title. It is usually the slide's first element, which is then also
+    # the first heading in document order; otherwise search the whole slide.
+    title_elem = next((child for child in slide.children if isinstance(child, Tag)), None)
+    if title_elem is None or title_elem.name not in ('h1', 'h2'):
+        title_elem = slide.find(['h1', 'h2'])
+    if title_elem:
+        title = title_elem.get_text().strip()
+    else:
+        title = f"Slide {slide_number}"
+    slide_data['title'] = title
+    
+    # Extract content parts; elements seen by more than one extractor
+    # (e.g. paragraphs inside metric boxes) share their extracted text.
+    # Slides with none of the extracted elements have nothing to yield.
+    content_parts = []
+    found = collect_slide_elements(slide)
+    if any(found.values()):
+        text_cache = {}
+        content_length = 0
+        for part in iter_content_parts(found, title, text_cache):
+            # Collapse line breaks up front so the budget counts cleaned text
+            if '\n\n\n' in part:
+                part = MULTI_NEWLINE_RE.sub('\n\n', part)
+            content_parts.append(part)
+            content_length += len(part) + 1
+            # Stop once the cleaned content is past the limit; anything further
+            # would be truncated away. Joins and stripping can still shorten
+            # the estimate, so confirm against the real cleaned text.
+            if content_length > max_chars and len(clean_content(content_parts)) > max_chars:
+                break
+    
+    # Clean up content and limit its length for readability
+    content = clean_content(content_parts)
+    if len(content) > max_chars:
+        content = content[:max_chars] + "..."
+    
+    # Store content as (is_bullet, line) pairs, one per paragraph on the slide
+    slide_data['content'] = [
+        (line.lstrip().startswith('•'), line)
+        for line in content.split('\n')
+    ] if content else []
+    
+    return slide_data
+
+def iter_slides(html_path='index.html', max_chars=CONTENT_CHAR_LIMIT):
+    """Parse the HTML file and yield each slide's data as soon as it is extracted"""
+    
+    # Read raw bytes and let the parser decode them, rather than decoding in Python first
+    with open(html_path, 'rb', buffering=READ_BUFFER_SIZE) as file:
+        content = file.read()
+    
+    # Only build the tree for slide containers; head, scripts and navigation are skipped
+    slide_strainer = SoupStrainer('div', class_=SLIDE_CLASS_RE)
+    soup = BeautifulSoup(content, 'lxml', parse_only=slide_strainer, from_encoding='utf-8')
+    del content  # The raw bytes are not needed once the tree is built
+    
+    # The strainer leaves only slide containers at the top level
+    slides = [tag for tag in soup.children if isinstance(tag, Tag)]
+    
+    # Extraction stays serial: it is pure-Python tree walking, so a thread pool
+    # only adds overhead under the GIL, and slides are decomposed in order
+    for i, slide in enumerate(slides, 1):
+        slide_data = extract_slide(i, slide, max_chars)
         
-        slide_data['content'] = '\n'.join(content_parts)
-        slides_data.append(slide_data)
+        # Release the slide's subtree before handing its data on
+        slide.decompose()
         
         print(f"Extracted Slide {i}: {slide_data['title']}")
+        yield slide_data
+
+def parse_html_file(html_path='index.html', max_chars=CONTENT_CHAR_LIMIT):
+    """Parse the HTML file and extract slide content, truncated to max_chars per slide"""
     
-    return slides_data
+    if not os.path.exists(html_path):
+        print(f"Error: {html_path} not found in current directory")
+        return None
+    
+    return list(iter_slides(html_path, max_chars))
 
 def create_powerpoint_presentation(slides_data, output_filename='Pride_Dealer_Services_Presentation.pptx'):
-    """Create PowerPoint presentation from extracted slide data"""
+    """Create PowerPoint presentation from extracted slide data (any iterable, consumed once)"""
     
     # Create presentation
     prs = Presentation()
     
-    # Define brand colors from your CSS
-    brand_gold = RGBColor(212, 175, 55)    # #d4af37
-    brand_dark = RGBColor(184, 148, 31)    # #b8941f  
-    dark_blue = RGBColor(26, 26, 46)       # #1a1a2e
-    surface_blue = RGBColor(22, 33, 62)    # #16213e
-    accent_blue = RGBColor(15, 52, 96)     # #0f3460
-    white = RGBColor(255, 255, 255)
-    light_gray = RGBColor(204, 204, 204)
+    # Resolve layouts and the slide collection once rather than per slide
+    title_layout = prs.slide_layouts[0]    # Title slide
+    content_layout = prs.slide_layouts[1]  # Title and content
+    slides = prs.slides
     
     def set_slide_background(slide, color):
         """Set slide background color"""
@@ -158,18 +323,40 @@ def create_powerpoint_presentation(slides_data, output_filename='Pride_Dealer_Se
         fill.solid()
         fill.fore_color.rgb = color
     
-    def add_branded_slide(title_text, content_text, is_title_slide=False):
+    # Content paragraph XML tag names and attribute values, formatted once per presentation
+    spc_bef_tag = qn('a:spcBef')
+    spc_aft_tag = qn('a:spcAft')
+    spc_pts_tag = qn('a:spcPts')
+    def_rpr_tag = qn('a:defRPr')
+    solid_fill_tag = qn('a:solidFill')
+    srgb_clr_tag = qn('a:srgbClr')
+    color_hex = str(WHITE)
+    space_before = str(BULLET_SPACE_BEFORE.centipoints)
+    space_after = str(PARAGRAPH_SPACE_AFTER.centipoints)
+    body_size = str(BODY_SIZE.centipoints)
+    bullet_size = str(BULLET_SIZE.centipoints)
+    
+    def format_content_paragraphs(content_frame, bullet_flags):
+        """Write spacing, size and color for each content paragraph straight into its XML"""
+        
+        # Setting text leaves one fresh <a:p> per line, so there is no existing pPr to merge with
+        for p, is_bullet in zip(content_frame._txBody.p_lst, bullet_flags):
+            # Make bullet points stand out
+            pPr = p.get_or_add_pPr()
+            if is_bullet:
+                SubElement(SubElement(pPr, spc_bef_tag), spc_pts_tag, val=space_before)
+            SubElement(SubElement(pPr, spc_aft_tag), spc_pts_tag, val=space_after)
+            defRPr = SubElement(pPr, def_rpr_tag, sz=bullet_size if is_bullet else body_size)
+            SubElement(SubElement(defRPr, solid_fill_tag), srgb_clr_tag, val=color_hex)
+    
+    def add_branded_slide(title_text, content_text, is_title_slide=False, bullet_flags=()):
         """Add a slide with Pride Dealer Services branding"""
         
-        if is_title_slide:
-            slide_layout = prs.slide_layouts[0]  # Title slide
-        else:
-            slide_layout = prs.slide_layouts[1]  # Title and content
-            
-        slide = prs.slides.add_slide(slide_layout)
+        slide_layout = title_layout if is_title_slide else content_layout
+        slide = slides.add_slide(slide_layout)
         
         # Set dark background
-        set_slide_background(slide, dark_blue)
+        set_slide_background(slide, DARK_BLUE)
         
         if is_title_slide:
             # Title slide formatting
@@ -177,43 +364,38 @@ def create_powerpoint_presentation(slides_data, output_filename='Pride_Dealer_Se
             subtitle = slide.placeholders[1]  # Subtitle placeholder
             
             title.text = title_text
-            title_frame = title.text_frame
-            title_frame.paragraphs[0].font.color.rgb = brand_gold
-            title_frame.paragraphs[0].font.size = Pt(44)
-            title_frame.paragraphs[0].font.bold = True
-            title_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
+            title_paragraph = title.text_frame.paragraphs[0]
+            title_paragraph.font.color.rgb = BRAND_GOLD
+            title_paragraph.font.size = TITLE_SLIDE_TITLE_SIZE
+            title_paragraph.font.bold = True
+            title_paragraph.alignment = PP_ALIGN.CENTER
             
             subtitle.text = "Investment Presentation\nNational Detail & Condition Reports Company"
             subtitle_frame = subtitle.text_frame
             for paragraph in subtitle_frame.paragraphs:
-                paragraph.font.color.rgb = light_gray
-                paragraph.font.size = Pt(18)
+                paragraph.font.color.rgb = LIGHT_GRAY
+                paragraph.font.size = TITLE_SLIDE_SUBTITLE_SIZE
                 paragraph.alignment = PP_ALIGN.CENTER
         else:
             # Regular slide formatting
             title = slide.shapes.title
             title.text = title_text
-            title_frame = title.text_frame
-            title_frame.paragraphs[0].font.color.rgb = brand_gold
-            title_frame.paragraphs[0].font.size = Pt(32)
-            title_frame.paragraphs[0].font.bold = True
+            title_paragraph = title.text_frame.paragraphs[0]
+            title_paragraph.font.color.rgb = BRAND_GOLD
+            title_paragraph.font.size = TITLE_SIZE
+            title_paragraph.font.bold = True
             
-            # Content
-            if len(slide.placeholders) > 1:
+            # Content; look the body placeholder up directly rather than counting placeholders first
+            try:
                 content_placeholder = slide.placeholders[1]
+            except KeyError:
+                content_placeholder = None
+            if content_placeholder is not None:
                 content_frame = content_placeholder.text_frame
                 content_frame.text = content_text
                 
                 # Format all paragraphs
-                for paragraph in content_frame.paragraphs:
-                    paragraph.font.color.rgb = white
-                    paragraph.font.size = Pt(14)
-                    paragraph.space_after = Pt(8)
-                    
-                    # Make bullet points stand out
-                    if paragraph.text.strip().startswith('•'):
-                        paragraph.font.size = Pt(12)
-                        paragraph.space_before = Pt(4)
+                format_content_paragraphs(content_frame, bullet_flags)
         
         return slide
     
@@ -221,30 +403,24 @@ def create_powerpoint_presentation(slides_data, output_filename='Pride_Dealer_Se
     for i, slide_data in enumerate(slides_data):
         title = slide_data['title']
         content = slide_data['content']
+        content_text = '\n'.join(line for _, line in content)
         
         # Skip slides with no meaningful content
-        if not content.strip() or len(content.strip()) < 20:
+        if len(content_text) < 20:
             print(f"Skipping slide {i+1} - insufficient content")
             continue
         
         # First slide is title slide
         is_title = (i == 0 and 'executive summary' in title.lower())
         
-        # Clean up content
-        content = content.replace('\n\n\n', '\n\n')  # Remove excessive line breaks
-        content = content.strip()
-        
-        # Limit content length for readability
-        if len(content) > 1500:
-            content = content[:1500] + "..."
-        
-        add_branded_slide(title, content, is_title_slide=is_title)
+        bullet_flags = [is_bullet for is_bullet, _ in content]
+        add_branded_slide(title, content_text, is_title_slide=is_title, bullet_flags=bullet_flags)
         print(f"Created PowerPoint slide: {title}")
     
     # Save presentation
     prs.save(output_filename)
     print(f"\nPowerPoint presentation saved as: {output_filename}")
-    print(f"Total slides created: {len(prs.slides)}")
+    print(f"Total slides created: {len(slides)}")
     
     return output_filename
 
@@ -260,20 +436,29 @@ def main():
         print("Make sure you're running this script in the same directory as your HTML file")
         return
     
-    # Parse HTML file
+    # Parse HTML file; slides are extracted lazily as the presentation is built
     print(f"Parsing {html_file}...")
-    slides_data = parse_html_file(html_file)
+    slides_data = iter_slides(html_file)
+    first_slide = next(slides_data, None)
     
-    if not slides_data:
+    if first_slide is None:
         print("Failed to parse HTML file")
         return
     
-    print(f"Found {len(slides_data)} slides")
+    # Count slides as the builder consumes them; the total is only known afterwards
+    slide_count = 0
+    
+    def count_slides(slides):
+        nonlocal slide_count
+        for slide_data in slides:
+            slide_count += 1
+            yield slide_data
     
     # Create PowerPoint presentation
     print("\nCreating PowerPoint presentation...")
-    output_file = create_powerpoint_presentation(slides_data)
+    output_file = create_powerpoint_presentation(count_slides(itertools.chain([first_slide], slides_data)))
     
+    print(f"Found {slide_count} slides")
     print(f"\nConversion completed successfully!")
     print(f"Output file: {output_file}")
 